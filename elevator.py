@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import heapq
 import logging
+import math
 import os
 import random
 import time
+from collections import deque
 from enum import Enum
-from typing import List, Set
+from logging.handlers import MemoryHandler
+from typing import Dict, Iterable, List, Optional, Set
 
 import elevator_exceptions
 from elevator_interface import IElevator, IPassenger, IElevatorObserver
@@ -18,9 +22,17 @@ class ElevatorDirection(Enum):
     UP = 1
 
 
+# Shared observer of the elevators created without one, its events are not dispatched at all
+_NOOP_OBSERVER = IElevatorObserver()
+
+
 class Elevator(IElevator):
     """Class representing an elevator."""
 
+    __slots__ = ('_logger', '_floors_count', '_current_floor', '_up_heap', '_down_heap_neg', '_pending',
+                 '_direction', '_direction_int', '_max_capacity', '_passengers', '_by_dest', '_is_open', '_is_moving',
+                 '_observer')
+
     def __init__(self, max_capacity: int = 8, floors_count: int = 10, observer: IElevatorObserver = None):
         """
         Initializes the Elevator object.
@@ -32,102 +44,182 @@ class Elevator(IElevator):
         self._logger = logging.getLogger('Elevator')
         self._floors_count = floors_count
         self._current_floor = 1
-        self._queue: List[int] = []  # Stores the floors requested by passengers
+        self._up_heap: List[int] = []  # Min-heap of the requested floors to serve on the way up
+        self._down_heap_neg: List[int] = []  # Max-heap (negated floors) of the requested floors to serve on the way down
+        self._pending: Set[int] = set()  # Stores the floors requested by passengers
         self._direction = ElevatorDirection.IDLE  # Indicates the current direction of the elevator
+        self._direction_int = 0  # Plain int copy of self._direction.value for direction checks on every move
         self._max_capacity = max_capacity
-        self._passengers: Set[IPassenger] = set()  # Stores the passengers currently inside the elevator
+        # Stores the passengers currently inside the elevator keyed by their id(), in the order they entered
+        self._passengers: Dict[int, IPassenger] = {}
+        # Passengers currently inside the elevator grouped by their destination floor
+        self._by_dest: Dict[int, List[IPassenger]] = {floor: [] for floor in range(1, floors_count + 1)}
         self._is_open = False  # Indicates whether the elevator doors are open
         self._is_moving = False  # Indicates whether the elevator is moving
 
-        if observer is None:
-            class DefaultObserver(IElevatorObserver):
-                pass
-            observer = DefaultObserver
-        self._observer = observer
+        self._observer = observer if observer is not None else _NOOP_OBSERVER
 
     # Methods for moving the elevator and updating its status
-    def _move_up(self):
-        """Move the elevator up one floor."""
-        self._logger.debug('Elevator moving up')
-        self._current_floor = min((self._current_floor + 1), self._floors_count)
+    def _move_up(self, floors: int = 1):
+        """Move the elevator up the given number of floors (one by default)."""
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug('Elevator moving up')
+        self._current_floor = min((self._current_floor + floors), self._floors_count)
+
+    def _move_down(self, floors: int = 1):
+        """Move the elevator down the given number of floors (one by default)."""
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug('Elevator moving down')
+        self._current_floor = max(self._current_floor - floors, 1)
+
+    def _travel(self, floors: int):
+        """Start the elevator and move it the given number of floors in the current direction."""
+        self._start_moving()
+
+        if self._direction_int == 1:
+            self._move_up(floors)
+        elif self._direction_int == -1:
+            self._move_down(floors)
+
+    def _next_up(self) -> Optional[int]:
+        """
+        Get the nearest requested floor at or above the current floor.
+
+        Served floors are dropped lazily from the top of the heap, requested floors the elevator is already above are
+        handed over to the down heap.
+        """
+        heap = self._up_heap
+        while heap:
+            floor = heap[0]
+            if floor not in self._pending:
+                heapq.heappop(heap)
+            elif floor < self._current_floor:
+                heapq.heappush(self._down_heap_neg, -heapq.heappop(heap))
+            else:
+                return floor
+        return None
+
+    def _next_down(self) -> Optional[int]:
+        """
+        Get the nearest requested floor at or below the current floor.
 
-    def _move_down(self):
-        """Move the elevator down one floor."""
-        self._logger.debug('Elevator moving down')
-        self._current_floor = max(self._current_floor - 1, 1)
+        Served floors are dropped lazily from the top of the heap, requested floors the elevator is already below are
+        handed over to the up heap.
+        """
+        heap = self._down_heap_neg
+        while heap:
+            floor = -heap[0]
+            if floor not in self._pending:
+                heapq.heappop(heap)
+            elif floor > self._current_floor:
+                heapq.heappush(self._up_heap, -heapq.heappop(heap))
+            else:
+                return floor
+        return None
 
     def _update_direction(self):
         """
-        Update the direction of the elevator based on the current floor and the destination floors in the queue.
+        Update the direction of the elevator based on the current floor and the requested floors (LOOK algorithm).
+
+        The elevator keeps its direction while there are requested floors ahead of it and reverses only when the last
+        requested floor in the current direction has been served.
         """
-        if self._queue:
-            direction = self._direction
-            if self.current_floor < self._queue[0]:
-                self._direction = ElevatorDirection.UP
-            elif self.current_floor > self._queue[0]:
-                self._direction = ElevatorDirection.DOWN
-            if direction is not self._direction:
-                self._logger.debug(f'Direction is changed. Moving {self._direction.name}')
-        else:
+        next_up = self._next_up()
+        next_down = self._next_down()
+        if next_up is None and next_down is None:
             self._direction = ElevatorDirection.IDLE
-            self._logger.debug('Elevator is IDLE')
+            self._direction_int = 0
+            if self._logger.isEnabledFor(logging.DEBUG):
+                self._logger.debug('Elevator is IDLE')
+            return
+
+        direction_int = self._direction_int
+        floors_above = next_up is not None and next_up > self._current_floor
+        floors_below = next_down is not None and next_down < self._current_floor
+        if direction_int == -1:
+            if floors_below:
+                direction_int = -1
+            elif floors_above:
+                direction_int = 1
+        else:
+            if floors_above:
+                direction_int = 1
+            elif floors_below:
+                direction_int = -1
+        if direction_int != self._direction_int:
+            self._direction = ElevatorDirection(direction_int)
+            self._direction_int = direction_int
+            if self._logger.isEnabledFor(logging.DEBUG):
+                self._logger.debug('Direction is changed. Moving %s', self._direction.name)
+
+    def _next_stop(self) -> Optional[int]:
+        """
+        Get the next requested floor in the current direction.
+
+        Every requested floor between the current floor and the returned one is in the same heap, so the elevator can
+        travel straight to it.
+        """
+        if self._direction_int == 1:
+            return self._next_up()
+        if self._direction_int == -1:
+            return self._next_down()
+        return None
 
     def _open_the_doors(self):
         """Open the elevator doors and pop the current floor from the queue as the elevator has arrived at the floor."""
         if self._is_moving:
             raise elevator_exceptions.ElevatorIsOpenedTheDoorsWhileMoving()
-        self._logger.debug('Opening the doors')
-        self._logger.info(f'Elevator arrived on {self._current_floor} floor')
-        self._queue.remove(self._current_floor)
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug('Opening the doors')
+        self._logger.info('Elevator arrived on %d floor', self._current_floor)
+        self._pending.discard(self._current_floor)
+        # The floor is usually the top of one of the heaps, other entries of it are dropped lazily
+        if self._up_heap and self._up_heap[0] == self._current_floor:
+            heapq.heappop(self._up_heap)
+        if self._down_heap_neg and self._down_heap_neg[0] == -self._current_floor:
+            heapq.heappop(self._down_heap_neg)
         self._is_open = True
-        self._logger.debug('Doors are open')
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug('Doors are open')
 
-        self._observer.on_open_doors(self)
+        if self._observer is not _NOOP_OBSERVER:
+            self._observer.on_open_doors(self)
 
 
     def _close_the_doors(self):
         """Close the elevator doors."""
-        self._logger.debug('Closing the doors')
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug('Closing the doors')
         self._is_open = False
-        self._logger.debug('Doors are closed')
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug('Doors are closed')
 
-        self._observer.on_close_doors(self)
+        if self._observer is not _NOOP_OBSERVER:
+            self._observer.on_close_doors(self)
 
     def _stop_moving(self):
         """Stop the elevator."""
-        self._logger.debug('Stopping Elevator')
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug('Stopping Elevator')
         self._is_moving = False
-        self._logger.debug('Elevator is stopped')
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug('Elevator is stopped')
 
-        self._observer.on_stop(self)
+        if self._observer is not _NOOP_OBSERVER:
+            self._observer.on_stop(self)
 
     def _start_moving(self):
         """Start the elevator."""
         if self._is_open:
             raise elevator_exceptions.ElevatorIsMoveWithOpenDoors()
-        if not self._is_moving:
+        if self._logger.isEnabledFor(logging.DEBUG) and not self._is_moving:
             self._logger.debug('Starting Elevator')
         self._is_moving = True
-        self._logger.debug('Elevator is moving')
-
-        self._observer.on_moving(self)
-
-    def _sort_queue(self):
-        """Sort the queue based on the current direction to handle requests efficiently."""
-
-        def key_func(floor):
-            """
-            A custom key function to determine the sorting order of floors in the elevator's queue.
-            The elevator's queue of floors needs to be sorted in a way that optimizes passengers' journey by not changing
-            direction until the last requested floor in the current direction has been served. This function calculates a key
-            value for each floor, which is then used for sorting.
-            """
-            if self._direction.value * (floor - self._current_floor) > 0:
-                return self._direction.value * (floor - self._current_floor)
-            else:
-                return self._direction.value * (self._current_floor - floor) + self._floors_count
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug('Elevator is moving')
 
-        self._queue.sort(key=key_func)
+        if self._observer is not _NOOP_OBSERVER:
+            self._observer.on_moving(self)
 
     def call_floor(self, floor: int):
         """
@@ -138,34 +230,49 @@ class Elevator(IElevator):
         if floor < 1 or floor > self._floors_count:
             raise elevator_exceptions.ElevatorFloorOutOfTheRangeException()
 
-        if floor not in self._queue and floor:
-            self._queue.append(floor)
-            self._sort_queue()
+        if floor not in self._pending:
+            self._pending.add(floor)
+            if floor >= self._current_floor:
+                heapq.heappush(self._up_heap, floor)
+            else:
+                heapq.heappush(self._down_heap_neg, -floor)
 
-        if self._direction is ElevatorDirection.IDLE:
+        if self._direction_int == 0:
             self._update_direction()
             if self._current_floor == floor:
                 self._open_the_doors()
 
-    def move(self):
-        """Move the elevator based on the current queue of floors to stop at and handle passenger requests."""
+    def move(self, steps: int = 1):
+        """
+        Move the elevator based on the current queue of floors to stop at and handle passenger requests.
+
+        :param steps: Maximum number of floors to travel (default: 1). The elevator stops earlier at the next requested
+                      floor.
+        :raises ValueError: If steps is less than 1.
+        """
+        if steps < 1:
+            raise ValueError(f'steps must be at least 1, got {steps}')
+
         if self.is_open:
             self._close_the_doors()
 
-        self._update_direction()
-
-        if self._direction is not ElevatorDirection.IDLE:
-            self._start_moving()
+        # A floor requested while the elevator is on it is served right away, the direction is updated on the next move
+        if self._current_floor not in self._pending:
+            self._update_direction()
 
-            if self._direction == ElevatorDirection.UP:
-                self._move_up()
-            elif self._direction == ElevatorDirection.DOWN:
-                self._move_down()
+            if self._direction_int != 0 and getattr(self._observer, 'wants_per_floor_tick', False):
+                for _ in range(steps):
+                    self._travel(1)
+                    if self._current_floor in self._pending:
+                        break
+            elif self._direction_int != 0:
+                self._travel(min(steps, abs(self._next_stop() - self._current_floor)))
 
-        if self._current_floor in self._queue:
+        if self._current_floor in self._pending:
             self._stop_moving()
             self._open_the_doors()
-        self._logger.debug(f'Current floor is {self._current_floor}')
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug('Current floor is %d', self._current_floor)
 
     @property
     def current_floor(self) -> int:
@@ -180,7 +287,7 @@ class Elevator(IElevator):
     @property
     def is_full(self) -> bool:
         """Check if the elevator is full."""
-        return len(self._passengers) == self._max_capacity
+        return len(self._passengers) >= self._max_capacity
 
     @property
     def is_open(self) -> bool:
@@ -190,7 +297,11 @@ class Elevator(IElevator):
     @property
     def passengers(self) -> List[IPassenger]:
         """List of passengers in the elevator"""
-        return list(self._passengers)
+        return list(self._passengers.values())
+
+    def _iter_passengers(self) -> Iterable[IPassenger]:
+        """Passengers in the elevator without copying them. The returned view must not be modified."""
+        return self._passengers.values()
 
     def append_passenger(self, passenger: IPassenger):
         """
@@ -200,6 +311,8 @@ class Elevator(IElevator):
         :raises elevator_exceptions.ElevatorIsFullException: If the elevator is already at full capacity.
         :raises elevator_exceptions.ElevatorDoorsClosed: If the elevator's doors are closed.
         :raises elevator_exceptions.ElevatorPassengerFloorsMismatch: If the elevator's current floor mismatch this passenger
+        :raises elevator_exceptions.ElevatorFloorOutOfTheRangeException: If the passenger's destination floor is outside
+                                                                         the building's floor range.
         """
         if self.is_full:
             raise elevator_exceptions.ElevatorIsFullException()
@@ -207,8 +320,14 @@ class Elevator(IElevator):
             raise elevator_exceptions.ElevatorDoorsClosed()
         if self.current_floor != passenger.current_floor:
             raise elevator_exceptions.ElevatorPassengerFloorsMismatch()
-        self._passengers.add(passenger)
-        self._observer.on_passenger_enter(self, passenger)
+        if passenger.destination_floor < 1 or passenger.destination_floor > self._floors_count:
+            raise elevator_exceptions.ElevatorFloorOutOfTheRangeException()
+        if id(passenger) in self._passengers:
+            return  # Already inside, adding it again must not duplicate its destination floor entry
+        self._passengers[id(passenger)] = passenger
+        self._by_dest[passenger.destination_floor].append(passenger)
+        if self._observer is not _NOOP_OBSERVER:
+            self._observer.on_passenger_enter(self, passenger)
 
     def remove_passenger(self, passenger: Passenger):
         """
@@ -217,10 +336,13 @@ class Elevator(IElevator):
         :param passenger: The Passenger object to be removed from the elevator.
         :raises elevator_exceptions.PassengerNotFoundException: If the passenger is not found in the elevator.
         """
-        if passenger not in self._passengers:
+        try:
+            del self._passengers[id(passenger)]
+        except KeyError:
             raise elevator_exceptions.PassengerNotFoundException()
-        self._passengers.remove(passenger)
-        self._observer.on_passenger_exit(self, passenger)
+        self._by_dest[passenger.destination_floor].remove(passenger)
+        if self._observer is not _NOOP_OBSERVER:
+            self._observer.on_passenger_exit(self, passenger)
 
     def set_observer(self, observer: IElevatorObserver):
         self._observer = observer
@@ -229,6 +351,8 @@ class Elevator(IElevator):
 class Passenger(IPassenger):
     """Class representing a passenger."""
 
+    __slots__ = ('_logger', '_passenger_id', '_current_floor', '_destination_floor')
+
     _passenger_count = 0
 
     def __init__(self, current_floor: int, destination_floor: int):
@@ -313,25 +437,39 @@ def setup_logging():
     file_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
 
+    # Buffer the file records and write them in batches, errors are written right away
+    buffered_file_handler = MemoryHandler(capacity=1024, flushLevel=logging.ERROR, target=file_handler)
+    buffered_file_handler.setLevel(logging.DEBUG)
+
     # Add the handlers to the logger
-    logger.addHandler(file_handler)
+    logger.addHandler(buffered_file_handler)
     logger.addHandler(console_handler)
 
 
-def simulate_elevator_activity(elevator: Elevator, probability=0.01, total_simulation_time: int = 24 * 60):
-    """Simulate elevator activity over a day."""
+def simulate_elevator_activity(elevator: Elevator, probability=0.01, total_simulation_time: int = 24 * 60,
+                               tick_delay: float = 1.0):
+    """
+    Simulate elevator activity over a day.
+
+    :param elevator: The Elevator object to simulate.
+    :param probability: Probability of a passenger request in each simulated minute (default: 0.01).
+    :param total_simulation_time: Number of simulated minutes (default: 24 * 60).
+    :param tick_delay: Real time in seconds to wait after each simulated minute (default: 1.0). Use 0 to run the
+                       simulation as fast as possible.
+    """
     logger = logging.getLogger('Simulation')
+    rand = random.random  # Bound once, it is called for every passenger request
+    floors_count = elevator.floors_count
 
     def generate_random_floor():
         """Generate a random floor number between 1 and the total number of floors."""
-        return random.randint(1, elevator.floors_count)
+        return int(rand() * floors_count) + 1
 
     def generate_random_destination(current_floor: int):
         """Generate a random destination floor different from the current floor."""
-        destination = generate_random_floor()
-        while destination == current_floor:
-            destination = generate_random_floor()
-        return destination
+        # Shift the current floor by 1..floors_count-1 floors around the building, so no retries are needed
+        offset = int(rand() * (floors_count - 1)) + 1
+        return (current_floor - 1 + offset) % floors_count + 1
 
     def generate_random_passenger_request():
         """Generate a random passenger request with current and destination floors."""
@@ -339,28 +477,48 @@ def simulate_elevator_activity(elevator: Elevator, probability=0.01, total_simul
         destination_floor = generate_random_destination(current_floor)
         return current_floor, destination_floor
 
-    passengers_waiting = []
-    passengers_skipped_elevator = []
+    def generate_request_minutes():
+        """
+        Generate the minutes with a passenger request, each minute having a request with the given probability.
+
+        Instead of drawing a number every minute, the gaps between requests are drawn from the geometric distribution.
+        """
+        if probability <= 0:
+            return
+        if probability >= 1:
+            yield from range(total_simulation_time)
+            return
+        log_no_request = math.log1p(-probability)
+        minute = int(math.log1p(-rand()) / log_no_request)
+        while minute < total_simulation_time:
+            yield minute
+            minute += int(math.log1p(-rand()) / log_no_request) + 1
+
+    # All passenger requests of the simulation are generated upfront, keyed by the minute they are made in
+    requests = {minute: generate_random_passenger_request() for minute in generate_request_minutes()}
+
+    # Passengers waiting for the elevator grouped by the floor they are waiting on
+    passengers_waiting: Dict[int, List[Passenger]] = {floor: [] for floor in range(1, floors_count + 1)}
+    passengers_skipped_elevator: deque[Passenger] = deque()
 
     class PassengersElevatorObserver(IElevatorObserver):
         def on_passenger_enter(self, _elevator: IElevator, _passenger: IPassenger):
-            for p in _elevator.passengers:
+            for p in _elevator._iter_passengers():
                 if p is not _passenger:
                     print(f"{p} meets {_passenger} in elevator")
 
         def on_open_doors(self, _elevator: IElevator):
-            passengers_to_exit = [p for p in elevator.passengers if
-                                  p.destination_floor == elevator.current_floor]
+            passengers_to_exit = _elevator._by_dest[_elevator.current_floor][:]
             for p in passengers_to_exit:
                 p.exit_elevator(_elevator)
 
             # Simulate passengers entering the elevator if it's on their current floor and it's not full
-            passengers_to_enter = [p for p in passengers_waiting if
-                                   p.current_floor == elevator.current_floor]
+            floor_waiting = passengers_waiting[_elevator.current_floor]
+            passengers_to_enter = floor_waiting[:]
+            floor_waiting.clear()
             for p in passengers_to_enter:
                 try:
                     p.enter_elevator(_elevator)
-                    passengers_waiting.remove(p)
                 except Exception as e:
                     passengers_skipped_elevator.append(p)
                     logger.warning(f"Failed to let {p} enter the elevator: {e}")
@@ -369,23 +527,24 @@ def simulate_elevator_activity(elevator: Elevator, probability=0.01, total_simul
 
     for minute in range(total_simulation_time):
         # Simulate passengers arriving and pressing the elevator button
-        if random.random() < probability:  # Probability of a passenger request in each minute (adjust as needed)
-            current_floor, destination_floor = generate_random_passenger_request()
+        if minute in requests:
+            current_floor, destination_floor = requests[minute]
             logger.info(f"Passenger requested elevator: Current Floor {current_floor}, Destination Floor {destination_floor}")
             passenger = Passenger(current_floor, destination_floor)
             passenger.call_elevator(elevator)
-            passengers_waiting.append(passenger)
+            passengers_waiting[passenger.current_floor].append(passenger)
 
         # Simulate elevator movement
         elevator.move()
 
-        for passenger in passengers_skipped_elevator:
+        # Passengers skipped again while being re-queued wait for the next minute
+        for _ in range(len(passengers_skipped_elevator)):
+            passenger = passengers_skipped_elevator.popleft()
             passenger.call_elevator(elevator)
-            passengers_waiting.append(passenger)
-
-        passengers_skipped_elevator = []
+            passengers_waiting[passenger.current_floor].append(passenger)
 
-        time.sleep(1)
+        if tick_delay:
+            time.sleep(tick_delay)
 
 
 if __name__ == '__main__':
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from _ast import List
 from abc import ABC, abstractmethod
+from typing import List
 
 
 class IPassenger(ABC):
     """Abstract class representing a passenger."""
 
+    __slots__ = ()
+
     @abstractmethod
     def enter_elevator(self, elevator: IElevator):
         """
@@ -55,9 +57,15 @@ class IPassenger(ABC):
 class IElevator(ABC):
     """Abstract class representing an elevator."""
 
+    __slots__ = ()
+
     @abstractmethod
-    def move(self):
-        """Move the elevator based on the current queue of floors to stop at and handle passenger requests."""
+    def move(self, steps: int = 1):
+        """
+        Move the elevator based on the current queue of floors to stop at and handle passenger requests.
+
+        :param steps: Maximum number of floors to travel (default: 1).
+        """
         pass
 
     @abstractmethod
@@ -129,6 +137,10 @@ class IElevatorObserver:
     about changes in the elevator's state and passenger interactions.
     """
 
+    # Whether the observer needs on_moving for every floor passed. Otherwise an elevator moving several floors at once
+    # goes straight to its next stop and triggers on_moving only once.
+    wants_per_floor_tick = False
+
     def on_open_doors(self, elevator: IElevator):
         """
         Event triggered when the elevator's doors are opened.
@@ -1,8 +1,105 @@
 # test_elevator.py
+import copy
+import heapq
+import logging
+import random
+
 import pytest
+from hypothesis import given, settings, strategies as st
+
+from elevator import Elevator, ElevatorDirection, Passenger, simulate_elevator_activity
+from elevator_exceptions import (ElevatorDoorsClosed, ElevatorFloorOutOfTheRangeException, ElevatorIsFullException,
+                                 ElevatorIsMoveWithOpenDoors, ElevatorIsOpenedTheDoorsWhileMoving,
+                                 PassengerNotFoundException)
+from elevator_interface import IElevatorObserver
+
+raises = pytest.raises
+parametrize = pytest.mark.parametrize
+
+UP, DOWN, IDLE = ElevatorDirection.UP, ElevatorDirection.DOWN, ElevatorDirection.IDLE
+
+
+# Passengers never change their floors, so the tests share them instead of building new ones
+P_1_2 = Passenger(current_floor=1, destination_floor=2)
+P_1_3 = Passenger(current_floor=1, destination_floor=3)
+P_1_4 = Passenger(current_floor=1, destination_floor=4)
+P_2_6 = Passenger(current_floor=2, destination_floor=6)
+P_3_7 = Passenger(current_floor=3, destination_floor=7)
+
+
+@pytest.fixture(scope="session")
+def elevator_factory():
+    """
+    Factory of elevators in their initial state.
+
+    Every configuration is built once per session, the factory returns copies of it that don't share any mutable state.
+    """
+    prototypes = {}
+
+    def make(max_capacity, floors_count):
+        if (max_capacity, floors_count) not in prototypes:
+            prototypes[max_capacity, floors_count] = Elevator(max_capacity=max_capacity, floors_count=floors_count)
+        elevator = copy.copy(prototypes[max_capacity, floors_count])
+        elevator._current_floor = 1
+        elevator._up_heap = []
+        elevator._down_heap_neg = []
+        elevator._pending = set()
+        elevator._direction = IDLE
+        elevator._direction_int = 0
+        elevator._passengers = {}
+        elevator._by_dest = {floor: [] for floor in range(1, floors_count + 1)}
+        elevator._is_open = False
+        elevator._is_moving = False
+        return elevator
+
+    return make
+
+
+@pytest.fixture
+def elevator(elevator_factory):
+    """
+    Elevator with 6 passengers capacity in a 20 floors building.
+    """
+    return elevator_factory(6, 20)
+
+
+@pytest.fixture
+def clean_elevator(elevator_factory):
+    """
+    Elevator with 2 passengers capacity in a 10 floors building.
+    """
+    return elevator_factory(2, 10)
+
+
+@pytest.fixture
+def full_elevator(clean_elevator):
+    """
+    Elevator with 2 passengers capacity in a 10 floors building, filled up with passengers entered through open doors.
+    """
+    clean_elevator._is_open = True
+    for _ in range(clean_elevator._max_capacity):
+        clean_elevator.append_passenger(Passenger(current_floor=1, destination_floor=2))
+    return clean_elevator
+
+
+def set_queue(elevator, floors):
+    """
+    Put the floors straight into the elevator's requested floors, bypassing call_floor.
+    """
+    for floor in floors:
+        elevator._pending.add(floor)
+        if floor >= elevator.current_floor:
+            heapq.heappush(elevator._up_heap, floor)
+        else:
+            heapq.heappush(elevator._down_heap_neg, -floor)
 
-import elevator_exceptions
-from elevator import Elevator, ElevatorDirection, Passenger
+
+def advance(elevator, moves):
+    """
+    Move the elevator the given number of times.
+    """
+    for _ in range(moves):
+        elevator.move()
 
 
 def test_elevator_initialization():
@@ -14,95 +111,102 @@ def test_elevator_initialization():
     assert elevator.current_floor == 1
     assert elevator.is_full is False
     assert elevator.is_open is False
-    assert elevator._direction == ElevatorDirection.IDLE
+    assert elevator._direction == IDLE
+    assert elevator._direction_int == 0
     assert elevator._max_capacity == 6
     assert elevator._is_moving is False
-    assert elevator._queue == []
-    assert elevator._passengers == set()
+    assert elevator._pending == set()
+    assert elevator._up_heap == []
+    assert elevator._down_heap_neg == []
+    assert elevator._passengers == {}
 
 
-def test_elevator_moving_up():
+def test_elevator_factory_matches_new_elevator(elevator_factory):
+    """
+    Test that the factory's elevators match a newly constructed one slot by slot and don't share mutable state.
+    """
+    elevator = elevator_factory(6, 20)
+    other = elevator_factory(6, 20)
+    new_elevator = Elevator(max_capacity=6, floors_count=20)
+
+    for slot in Elevator.__slots__:
+        value = getattr(elevator, slot)
+        assert value == getattr(new_elevator, slot), slot
+        if isinstance(value, (list, set, dict)):
+            assert value is not getattr(other, slot), slot
+    for floor, floor_passengers in elevator._by_dest.items():
+        assert floor_passengers is not other._by_dest[floor], floor
+
+
+def test_elevator_moving_up(elevator):
     """
     Test the elevator's movement in the upward direction.
     """
-    elevator = Elevator(max_capacity=6, floors_count=20)
     elevator._current_floor = 5
-    elevator._queue = [7, 9, 11]
+    set_queue(elevator, [7, 9, 11])
 
     elevator.move()
 
     assert elevator.current_floor == 6
 
 
-def test_elevator_moving_down():
+def test_elevator_moving_down(elevator):
     """
     Test the elevator's movement in the downward direction.
     """
-    elevator = Elevator(max_capacity=6, floors_count=20)
     elevator._current_floor = 10
-    elevator._queue = [7, 5, 3]
+    set_queue(elevator, [7, 5, 3])
 
     elevator._move_down()
 
     assert elevator.current_floor == 9
 
 
-def test_elevator_update_direction():
+@parametrize("floor,queue,expected", [
+    (10, [15, 12, 17], UP),
+    (18, [15, 12, 9], DOWN),
+    (13, [], IDLE),
+])
+def test_elevator_update_direction(elevator, floor, queue, expected):
     """
     Test the update_direction method of the Elevator class.
     """
-    elevator = Elevator(max_capacity=6, floors_count=20)
-    elevator._current_floor = 10
-    elevator._queue = [15, 12, 17]
-
-    elevator._update_direction()
-
-    assert elevator._direction == ElevatorDirection.UP
-
-    elevator._current_floor = 18
-    elevator._queue = [15, 12, 9]
+    elevator._current_floor = floor
+    set_queue(elevator, queue)
 
     elevator._update_direction()
 
-    assert elevator._direction == ElevatorDirection.DOWN
+    assert elevator._direction == expected
 
-    elevator._current_floor = 13
-    elevator._queue = []
 
-    elevator._update_direction()
-
-    assert elevator._direction == ElevatorDirection.IDLE
-
-
-def test_elevator_open_and_close_doors():
+def test_elevator_open_and_close_doors(elevator):
     """
     Test the open_the_doors and close_the_doors methods of the Elevator class.
     """
-    elevator = Elevator(max_capacity=6, floors_count=20)
     elevator._is_moving = True
 
-    with pytest.raises(elevator_exceptions.ElevatorIsOpenedTheDoorsWhileMoving):
+    with raises(ElevatorIsOpenedTheDoorsWhileMoving):
         elevator._open_the_doors()
 
     elevator._current_floor = 7
     elevator._is_moving = False
     elevator._is_open = False
-    elevator._queue = [7, 5, 3]
+    set_queue(elevator, [7, 5, 3])
 
     elevator._open_the_doors()
 
     assert elevator._is_open is True
-    assert elevator._queue == [5, 3]
+    assert elevator._pending == {5, 3}
+    assert elevator._up_heap == []
 
 
-def test_elevator_start_and_stop_moving():
+def test_elevator_start_and_stop_moving(elevator):
     """
     Test the _start_moving and _stop_moving methods of the Elevator class.
     """
-    elevator = Elevator(max_capacity=6, floors_count=20)
     elevator._is_open = True
 
-    with pytest.raises(elevator_exceptions.ElevatorIsMoveWithOpenDoors):
+    with raises(ElevatorIsMoveWithOpenDoors):
         elevator._start_moving()
 
     elevator._is_open = False
@@ -116,81 +220,252 @@ def test_elevator_start_and_stop_moving():
     assert elevator._is_moving is False
 
 
-def test_elevator_sort_queue():
+class StopsObserver(IElevatorObserver):
     """
-    Test the _sort_queue method of the Elevator class.
+    Observer recording the floors where the elevator opens its doors.
     """
-    elevator = Elevator(max_capacity=6, floors_count=20)
-    elevator._current_floor = 10
-    elevator._direction = ElevatorDirection.UP
-    elevator._queue = [15, 12, 17, 3, 8]
 
-    elevator._sort_queue()
+    def __init__(self):
+        self.stops = []
 
-    assert elevator._queue == [12, 15, 17, 8, 3]
+    def on_open_doors(self, elevator):
+        self.stops.append(elevator.current_floor)
 
 
-def test_elevator_call_floor():
+def look_order(floor, direction, queue):
     """
-    Test the call_floor method of the Elevator class.
+    Reference order in which the LOOK algorithm serves the queue, starting on the floor in the direction.
     """
-    elevator = Elevator(max_capacity=6, floors_count=20)
+    current = [floor] if floor in queue else []
+    up = sorted(f for f in set(queue) if f > floor)
+    down = sorted((f for f in set(queue) if f < floor), reverse=True)
+    if direction == DOWN:
+        return current + down + up
+    return current + up + down
 
-    with pytest.raises(elevator_exceptions.ElevatorFloorOutOfTheRangeException):
-        elevator.call_floor(0)
 
-    with pytest.raises(elevator_exceptions.ElevatorFloorOutOfTheRangeException):
-        elevator.call_floor(25)
+def test_look_order_reference():
+    """
+    Test the reference LOOK order used by the elevator tests.
+    """
+    assert look_order(10, UP, [15, 12, 17, 3, 8]) == [12, 15, 17, 8, 3]
+
+
+@parametrize("floor,direction,queue", [
+    (10, UP, [15, 12, 17, 3, 8]),
+    (10, DOWN, [15, 12, 17, 3, 8]),
+    (5, IDLE, [1, 9, 4, 6]),
+    (1, UP, [20, 1, 10]),
+    (20, DOWN, [1, 20, 11]),
+    (7, UP, [3, 2]),
+    (7, DOWN, [9, 12]),
+    (5, UP, [6, 6, 2, 2]),
+])
+def test_elevator_look_order(elevator, floor, direction, queue):
+    """
+    Test that the elevator serves the requested floors in the current direction before reversing.
+    """
+    observer = StopsObserver()
+    elevator.set_observer(observer)
+    elevator._current_floor = floor
+    elevator._direction = direction
+    elevator._direction_int = direction.value
+    set_queue(elevator, queue)
+
+    while elevator._pending:
+        elevator.move()
 
-    elevator.call_floor(7)
-    elevator.call_floor(5)
-    elevator.call_floor(10)
+    assert observer.stops == look_order(floor, direction, queue)
 
-    assert elevator._queue == [5, 7, 10]
 
+@settings(max_examples=50)
+@given(floor=st.integers(1, 20), direction=st.sampled_from(list(ElevatorDirection)),
+       queue=st.lists(st.integers(1, 20), max_size=10))
+def test_elevator_stops_invariants(elevator_factory, floor, direction, queue):
+    """
+    Test that the elevator stops once on every requested floor and changes its direction at most once on the way.
+    """
+    elevator = elevator_factory(6, 20)
+    observer = StopsObserver()
+    elevator.set_observer(observer)
+    elevator._current_floor = floor
+    elevator._direction = direction
+    elevator._direction_int = direction.value
+    set_queue(elevator, queue)
+
+    for _ in range(4 * elevator.floors_count):
+        if not elevator._pending:
+            break
+        elevator.move()
 
-def test_elevator_move():
+    stops = observer.stops
+    assert sorted(stops) == sorted(set(queue))
+
+    moves = [1 if b > a else -1 for a, b in zip([floor] + stops, stops) if a != b]
+    assert sum(1 for a, b in zip(moves, moves[1:]) if a != b) <= 1
+    if moves and direction is not IDLE and any(direction.value * (f - floor) > 0 for f in queue):
+        assert moves[0] == direction.value
+
+
+@parametrize("bad_floor", [0, 25])
+def test_elevator_call_floor_out_of_range(elevator, bad_floor):
+    """
+    Test that the call_floor method of the Elevator class rejects floors outside the building.
+    """
+    with raises(ElevatorFloorOutOfTheRangeException):
+        elevator.call_floor(bad_floor)
+
+
+@parametrize("calls,expected_queue", [
+    ([7, 5, 10], [5, 7, 10]),
+    ([3, 9, 3], [3, 9]),
+])
+def test_elevator_call_floor(elevator, calls, expected_queue):
+    """
+    Test the call_floor method of the Elevator class.
+    """
+    for floor in calls:
+        elevator.call_floor(floor)
+
+    assert elevator._pending == set(expected_queue)
+    assert sorted(elevator._up_heap) == expected_queue
+    assert elevator._direction == UP
+
+
+@parametrize("moves,floor,direction,is_moving,is_open", [
+    (1, 2, UP, True, False),
+    (4, 5, UP, False, True),
+    (5, 6, UP, True, False),
+    (6, 7, UP, False, True),
+    (10, 10, IDLE, False, False),
+])
+def test_elevator_move(elevator, moves, floor, direction, is_moving, is_open):
     """
     Test the movement of the elevator based on the current queue.
     """
-    elevator = Elevator(max_capacity=6, floors_count=20)
-    elevator._is_open = False
-    elevator._queue = [5, 7, 10]
+    set_queue(elevator, [5, 7, 10])
 
-    elevator.move()
+    advance(elevator, moves)
+
+    assert (elevator.current_floor, elevator._direction, elevator._is_moving, elevator._is_open) == \
+           (floor, direction, is_moving, is_open)
+
+
+def test_elevator_move_several_floors(elevator):
+    """
+    Test that the elevator travels several floors at once, but stops at the next requested floor.
+    """
+    set_queue(elevator, [5, 7, 10])
+
+    elevator.move(steps=3)
 
-    assert elevator.current_floor == 2
-    assert elevator._direction == ElevatorDirection.UP
+    assert elevator.current_floor == 4
     assert elevator._is_moving is True
-    assert elevator._is_open is False
 
-    for i in range(3):
-        elevator.move()
+    elevator.move(steps=20)
 
     assert elevator.current_floor == 5
-    assert elevator._direction == ElevatorDirection.UP
-    assert elevator._is_moving is False
     assert elevator._is_open is True
 
-    elevator.move()
+    elevator.move(steps=20)
+    elevator.move(steps=20)
 
-    assert elevator.current_floor == 6
-    assert elevator._direction == ElevatorDirection.UP
-    assert elevator._is_moving is True
-    assert elevator._is_open is False
+    assert elevator.current_floor == 10
+    assert elevator._pending == set()
 
-    elevator.move()
 
-    assert elevator.current_floor == 7
-    assert elevator._direction == ElevatorDirection.UP
-    assert elevator._is_moving is False
-    assert elevator._is_open is True
+@parametrize("steps", [0, -1])
+def test_elevator_move_invalid_steps(elevator, steps):
+    """
+    Test that the elevator refuses to move less than one floor and keeps its state.
+    """
+    set_queue(elevator, [5])
+
+    with raises(ValueError):
+        elevator.move(steps=steps)
+
+    assert (elevator.current_floor, elevator._is_moving) == (1, False)
+
 
-    for i in range(4):
+def test_elevator_debug_logging_enabled_later(elevator, caplog):
+    """
+    Test that an elevator built before DEBUG logging is enabled still logs its DEBUG messages afterwards.
+    """
+    set_queue(elevator, [2])
+
+    with caplog.at_level(logging.DEBUG, logger='Elevator'):
         elevator.move()
 
-    assert elevator.current_floor == 10
-    assert elevator._direction == ElevatorDirection.IDLE
+    assert 'Current floor is 2' in caplog.messages
+
+
+def test_elevator_move_several_floors_per_floor_observer(elevator):
+    """
+    Test that an observer asking for every floor is notified on each floor when the elevator moves several floors.
+    """
+    class FloorsObserver(IElevatorObserver):
+        wants_per_floor_tick = True
+
+        def __init__(self):
+            self.floors = []
+
+        def on_moving(self, elevator):
+            self.floors.append(elevator.current_floor)
+
+    observer = FloorsObserver()
+    elevator.set_observer(observer)
+    set_queue(elevator, [5])
+
+    elevator.move(steps=20)
+
+    assert elevator.current_floor == 5
+    assert observer.floors == [1, 2, 3, 4]
+
+
+def test_elevator_move_duck_typed_observer(elevator):
+    """
+    Test that an observer implementing the callbacks without subclassing IElevatorObserver still works.
+    """
+    class DuckObserver:
+        def __init__(self):
+            self.stops = []
+
+        def on_open_doors(self, elevator):
+            self.stops.append(elevator.current_floor)
+
+        def on_close_doors(self, elevator):
+            pass
+
+        def on_stop(self, elevator):
+            pass
+
+        def on_moving(self, elevator):
+            pass
+
+    observer = DuckObserver()
+    elevator.set_observer(observer)
+    set_queue(elevator, [5])
+
+    elevator.move(steps=20)
+
+    assert observer.stops == [5]
+
+
+def test_elevator_move_serves_current_floor(elevator):
+    """
+    Test that a floor requested while the elevator is on it is served without moving.
+    """
+    elevator._current_floor = 5
+    elevator._direction = DOWN
+    elevator._direction_int = -1
+    set_queue(elevator, [5, 3])
+
+    elevator.move()
+
+    assert elevator.current_floor == 5
+    assert elevator._is_open is True
+    assert elevator._direction == DOWN
+    assert elevator._pending == {3}
 
 
 def test_passenger_initialization():
@@ -201,90 +476,185 @@ def test_passenger_initialization():
     assert passenger.current_floor == 3
 
 
-def test_passenger_enter_and_exit_elevator():
+def test_passenger_enter_and_exit_elevator(clean_elevator):
     """
     Test the enter_elevator and exit_elevator methods of the Passenger class.
     """
-    elevator = Elevator(max_capacity=2, floors_count=10)
-    passenger1 = Passenger(current_floor=1, destination_floor=3)
-    passenger2 = Passenger(current_floor=1, destination_floor=2)
-    passenger3 = Passenger(current_floor=1, destination_floor=4)
+    elevator = clean_elevator
+    passenger1, passenger2, passenger3 = P_1_3, P_1_2, P_1_4
+    # The elevator updates these in place
+    passengers = elevator._passengers
+    queue = elevator._pending
 
     passenger1.call_elevator(elevator)
     passenger1.enter_elevator(elevator)
-    assert len(elevator._passengers) == 1
-    assert elevator._queue == [3]
+    assert len(passengers) == 1
+    assert queue == {3}
+    assert elevator._by_dest[3] == [passenger1]
     passenger2.enter_elevator(elevator)
 
-    with pytest.raises(elevator_exceptions.ElevatorIsFullException):
+    with raises(ElevatorIsFullException):
         passenger3.enter_elevator(elevator)
 
     elevator.move()
     passenger2.exit_elevator(elevator)
-    assert len(elevator._passengers) == 1
-    assert elevator._queue == [3]
+    assert len(passengers) == 1
+    assert elevator._by_dest[2] == []
+    assert queue == {3}
 
     elevator.move()
     passenger1.exit_elevator(elevator)
-    assert len(elevator._passengers) == 0
-    assert elevator._queue == []
+    assert len(passengers) == 0
+    assert queue == set()
 
 
-def test_passenger_call_elevator():
+def call_elevator_steps(elevator):
     """
-    Test the call_elevator method of the Passenger class.
+    Run the call_elevator scenario on the elevator, pausing after every step.
     """
-    elevator = Elevator(max_capacity=2, floors_count=10)
-    passenger1 = Passenger(current_floor=2, destination_floor=6)
-    passenger2 = Passenger(current_floor=3, destination_floor=7)
+    passenger1, passenger2 = P_2_6, P_3_7
 
     passenger1.call_elevator(elevator)
-    assert elevator._queue == [2]
+    yield
 
     passenger2.call_elevator(elevator)
-    assert elevator._queue == [2, 3]
+    yield
 
     elevator.move()
     passenger1.enter_elevator(elevator)
-    assert elevator._queue == [3, 6]
+    yield
 
     elevator.move()
     passenger2.enter_elevator(elevator)
-    assert elevator._queue == [6, 7]
+    yield
 
 
-def test_elevator_exceptions():
+@parametrize("steps,expected_queue", [
+    (1, {2}),
+    (2, {2, 3}),
+    (3, {3, 6}),
+    (4, {6, 7}),
+])
+def test_passenger_call_elevator(clean_elevator, steps, expected_queue):
     """
-    Test various exception scenarios in the Elevator and Passenger classes.
+    Test the call_elevator method of the Passenger class.
     """
-    elevator = Elevator(max_capacity=2, floors_count=10)
-    passenger1 = Passenger(current_floor=2, destination_floor=6)
+    elevator = clean_elevator
+    scenario = call_elevator_steps(elevator)
 
-    with pytest.raises(elevator_exceptions.PassengerNotFoundException):
-        elevator.remove_passenger(passenger1)
+    for _ in range(steps):
+        next(scenario)
 
-    with pytest.raises(elevator_exceptions.ElevatorIsFullException):
-        elevator._passengers.add(Passenger(1, 2))
-        elevator._passengers.add(Passenger(1, 2))
-        elevator.append_passenger(passenger1)
+    assert elevator._pending == expected_queue
 
-    elevator._passengers = set()
 
-    with pytest.raises(elevator_exceptions.ElevatorIsMoveWithOpenDoors):
-        elevator._is_open = True
-        elevator._start_moving()
+def test_remove_missing_passenger(clean_elevator):
+    """
+    Test that removing a passenger who is not in the elevator raises an exception.
+    """
+    with raises(PassengerNotFoundException):
+        clean_elevator.remove_passenger(P_2_6)
 
-    with pytest.raises(elevator_exceptions.ElevatorIsOpenedTheDoorsWhileMoving):
-        elevator._is_moving = True
-        elevator._open_the_doors()
 
-    with pytest.raises(elevator_exceptions.ElevatorDoorsClosed):
-        elevator._is_open = False
-        elevator.append_passenger(passenger1)
+def test_append_destination_out_of_range(clean_elevator):
+    """
+    Test that a passenger heading outside the building can't enter the elevator and leaves it untouched.
+    """
+    passenger = Passenger(current_floor=1, destination_floor=25)
+    clean_elevator._is_open = True
 
+    with raises(ElevatorFloorOutOfTheRangeException):
+        clean_elevator.append_passenger(passenger)
 
-# Add more test cases as needed for more scenarios
+    assert clean_elevator._passengers == {}
+    assert all(floor_passengers == [] for floor_passengers in clean_elevator._by_dest.values())
+
+    with raises(PassengerNotFoundException):
+        clean_elevator.remove_passenger(passenger)
+
+
+def test_append_passenger_twice(clean_elevator):
+    """
+    Test that adding a passenger already inside the elevator changes nothing, so one removal takes it out completely.
+    """
+    passenger = Passenger(current_floor=1, destination_floor=2)
+    clean_elevator._is_open = True
+
+    clean_elevator.append_passenger(passenger)
+    clean_elevator.append_passenger(passenger)
+
+    assert clean_elevator._by_dest[2] == [passenger]
+
+    clean_elevator.remove_passenger(passenger)
+
+    assert clean_elevator._passengers == {}
+    assert clean_elevator._by_dest[2] == []
+
+
+def test_append_when_full(full_elevator):
+    """
+    Test that a passenger can't be added to a full elevator.
+    """
+    with raises(ElevatorIsFullException):
+        full_elevator.append_passenger(P_2_6)
+
+
+def test_start_moving_with_open_doors(clean_elevator):
+    """
+    Test that the elevator can't start moving with open doors.
+    """
+    clean_elevator._is_open = True
 
+    with raises(ElevatorIsMoveWithOpenDoors):
+        clean_elevator._start_moving()
 
-if __name__ == '__main__':
-    pytest.main()
+
+def test_open_doors_while_moving(clean_elevator):
+    """
+    Test that the elevator can't open the doors while moving.
+    """
+    clean_elevator._is_moving = True
+
+    with raises(ElevatorIsOpenedTheDoorsWhileMoving):
+        clean_elevator._open_the_doors()
+
+
+def test_append_when_doors_closed(clean_elevator):
+    """
+    Test that a passenger can't enter the elevator while its doors are closed.
+    """
+    with raises(ElevatorDoorsClosed):
+        clean_elevator.append_passenger(P_2_6)
+
+
+def test_simulate_elevator_activity(clean_elevator, monkeypatch):
+    """
+    Test that a simulation without a delay between minutes delivers passengers to their destination floors.
+    """
+    elevator = clean_elevator
+    monkeypatch.setattr(random, 'random', random.Random(42).random)
+
+    exits = []
+    exit_elevator = Passenger.exit_elevator
+
+    def record_exit(passenger, _elevator):
+        exits.append((passenger.destination_floor, _elevator.current_floor))
+        exit_elevator(passenger, _elevator)
+
+    monkeypatch.setattr(Passenger, 'exit_elevator', record_exit)
+
+    simulate_elevator_activity(elevator, probability=0.5, total_simulation_time=200, tick_delay=0)
+
+    # Let the elevator finish the requests left at the end of the simulation
+    for _ in range(100 * elevator.floors_count):
+        if not elevator._pending:
+            break
+        elevator.move()
+
+    assert exits
+    assert all(destination_floor == floor for destination_floor, floor in exits)
+    assert elevator._pending == set()
+    assert elevator._passengers == {}
+
+
+# Add more test cases as needed for more scenarios